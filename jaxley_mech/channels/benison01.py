@@ -1,6 +1,6 @@
-from typing import Dict, Optional
+from typing import Dict, NamedTuple, Optional
 
-import jax.debug
+import jax
 import jax.numpy as jnp
 from jax.lax import select
 from jaxley.channels import Channel
@@ -13,7 +13,25 @@ from jaxley.solver_gate import (
 
 from ..utils import efun
 
-__all__ = ["Leak", "Na", "Kdr", "KA", "CaL", "CaN", "CaPumpNS", "KCa"]
+__all__ = [
+    "Leak",
+    "Na",
+    "Kdr",
+    "KA",
+    "CaL",
+    "CaN",
+    "CaPumpNS",
+    "KCa",
+    "GateRates",
+    "fused_rates",
+    "update_all_gates",
+    "GATE_NAMES",
+    "GATE_INDEX",
+    "gates_to_array",
+    "gates_from_array",
+    "update_gates_soa",
+    "fused_calcium_currents",
+]
 
 META = {
     "species": "cat",
@@ -23,6 +41,33 @@ META = {
 }
 
 
+# Voltage grid for the optional rate lookup tables: covers the physiological
+# range finely enough (~0.16 mV spacing) that linear interpolation is
+# indistinguishable from the exact rates.
+_TABLE_V_RANGE = (-100.0, 60.0)
+_TABLE_SIZE = 1024
+
+
+def _tabulate_rates(gate_fn, v_grid):
+    """Evaluate a gate's rate functions on the grid, one table per rate."""
+    return tuple(jnp.broadcast_to(rate, v_grid.shape) for rate in gate_fn(v_grid))
+
+
+def _interp_rates(v, v_grid, tables):
+    """Linearly interpolate tabulated rates at the given voltages."""
+    return tuple(jnp.interp(v, v_grid, table) for table in tables)
+
+
+def _promote_gate(x, gate_dtype):
+    """Promote a gate stored in reduced precision to float32 for the update."""
+    return jnp.asarray(x).astype(jnp.float32) if gate_dtype is not None else x
+
+
+def _demote_gate(x, gate_dtype):
+    """Demote an updated gate back to its storage dtype."""
+    return x.astype(gate_dtype) if gate_dtype is not None else x
+
+
 class Leak(Channel):
     """Leakage current"""
 
@@ -37,6 +82,18 @@ class Leak(Channel):
         self.channel_states = {}
         self.current_name = f"iLeak"
         self.META = META
+        self._cache_keys()
+
+    def _cache_keys(self):
+        """Cache the prefixed param keys so the hot methods skip f-strings."""
+        prefix = self._name
+        self._k_gLeak = f"{prefix}_gLeak"
+        self._k_eLeak = f"{prefix}_eLeak"
+
+    def change_name(self, new_name: str):
+        super().change_name(new_name)
+        self._cache_keys()
+        return self
 
     def update_states(
         self, states: Dict[str, jnp.ndarray], dt, v, params: Dict[str, jnp.ndarray]
@@ -48,9 +105,8 @@ class Leak(Channel):
         self, states: Dict[str, jnp.ndarray], v, params: Dict[str, jnp.ndarray]
     ):
         """""Return the updated states.""" ""
-        prefix = self._name
-        gLeak = params[f"{prefix}_gLeak"]  # S/cm^2
-        return gLeak * (v - params[f"{prefix}_eLeak"])  # S/cm^2 * mV = mA/cm^2
+        gLeak = params[self._k_gLeak]  # S/cm^2
+        return gLeak * (v - params[self._k_eLeak])  # S/cm^2 * mV = mA/cm^2
 
     def init_state(self, states, v, params, delta_t):
         """Initialize the state such at fixed point of gate dynamics."""
@@ -60,9 +116,17 @@ class Leak(Channel):
 class Na(Channel):
     """Sodium channel"""
 
-    def __init__(self, name: Optional[str] = None):
+    def __init__(self, name: Optional[str] = None, gate_dtype=None, use_table=False):
         self.current_is_in_mA_per_cm2 = True
         super().__init__(name)
+        # Gates lie in [0, 1], so e.g. jnp.bfloat16 storage halves their
+        # memory traffic; voltages must stay in full precision.
+        self._gate_dtype = gate_dtype
+        self._use_table = use_table
+        if use_table:
+            self._v_grid = jnp.linspace(*_TABLE_V_RANGE, _TABLE_SIZE)
+            self._m_table = _tabulate_rates(Na.m_gate, self._v_grid)
+            self._h_table = _tabulate_rates(Na.h_gate, self._v_grid)
         prefix = self._name
         self.channel_params = {
             f"{prefix}_gNa": 150e-3,  # S/cm^2
@@ -72,6 +136,20 @@ class Na(Channel):
         self.current_name = f"iNa"
         self.META = META
         self.META.update({"ion": "Na"})
+        self._cache_keys()
+
+    def _cache_keys(self):
+        """Cache the prefixed param/state keys so the hot methods skip f-strings."""
+        prefix = self._name
+        self._k_m = f"{prefix}_m"
+        self._k_h = f"{prefix}_h"
+        self._k_gNa = f"{prefix}_gNa"
+        self._k_eNa = f"{prefix}_eNa"
+
+    def change_name(self, new_name: str):
+        super().change_name(new_name)
+        self._cache_keys()
+        return self
 
     def update_states(
         self,
@@ -81,41 +159,56 @@ class Na(Channel):
         params: Dict[str, jnp.ndarray],
     ):
         """Return the updated states."""
-        prefix = self._name
-        m, h = states[f"{prefix}_m"], states[f"{prefix}_h"]
-        new_m = solve_gate_exponential(m, dt, *Na.m_gate(v))
-        new_h = solve_gate_exponential(h, dt, *Na.h_gate(v))
-        return {f"{prefix}_m": new_m, f"{prefix}_h": new_h}
+        m = _promote_gate(states[self._k_m], self._gate_dtype)
+        h = _promote_gate(states[self._k_h], self._gate_dtype)
+        new_m = solve_gate_exponential(m, dt, *self._m_rates(v))
+        new_h = solve_gate_exponential(h, dt, *self._h_rates(v))
+        return {
+            self._k_m: _demote_gate(new_m, self._gate_dtype),
+            self._k_h: _demote_gate(new_h, self._gate_dtype),
+        }
 
     def compute_current(
         self, states: Dict[str, jnp.ndarray], v, params: Dict[str, jnp.ndarray]
     ):
         """Return the updated states."""
-        prefix = self._name
-        m, h = states[f"{prefix}_m"], states[f"{prefix}_h"]
-        gNa = params[f"{prefix}_gNa"] * (m**3) * h  # S/cm^2
-        return gNa * (v - params[f"{prefix}_eNa"])  # S/cm^2 * mV = mA/cm^2
+        m = _promote_gate(states[self._k_m], self._gate_dtype)
+        h = _promote_gate(states[self._k_h], self._gate_dtype)
+        # Balanced grouping: the two products are independent, so XLA can
+        # fuse them as parallel multiply-adds instead of a serial chain.
+        gNa = params[self._k_gNa] * (m * m) * (m * h)  # S/cm^2
+        return gNa * (v - params[self._k_eNa])  # S/cm^2 * mV = mA/cm^2
 
     def init_state(self, states, v, params, delta_t):
         """Initialize the state such at fixed point of gate dynamics."""
-        prefix = self._name
-        alpha_m, beta_m = Na.m_gate(v)
-        alpha_h, beta_h = Na.h_gate(v)
+        alpha_m, beta_m = self._m_rates(v)
+        alpha_h, beta_h = self._h_rates(v)
         return {
-            f"{prefix}_m": alpha_m / (alpha_m + beta_m),
-            f"{prefix}_h": alpha_h / (alpha_h + beta_h),
+            self._k_m: _demote_gate(alpha_m / (alpha_m + beta_m), self._gate_dtype),
+            self._k_h: _demote_gate(alpha_h / (alpha_h + beta_h), self._gate_dtype),
         }
 
+    def _m_rates(self, v):
+        """m-gate rates, interpolated from the table when enabled."""
+        if self._use_table:
+            return _interp_rates(v, self._v_grid, self._m_table)
+        return Na.m_gate(v)
+
+    def _h_rates(self, v):
+        """h-gate rates, interpolated from the table when enabled."""
+        if self._use_table:
+            return _interp_rates(v, self._v_grid, self._h_table)
+        return Na.h_gate(v)
+
     @staticmethod
     def m_gate(v):
         v += 1e-6
-        alpha = 0.5 * (v + 29.0) / (1 - save_exp(-0.18 * (v + 29.0)))
+        alpha = 0.5 * efun(-(v + 29.0), 1.0 / 0.18)
         beta = 6.0 * save_exp(-(v + 45.0) / 15.0)
         return alpha, beta
 
     @staticmethod
     def h_gate(v):
-        v += 1e-6
         alpha = 0.15 * save_exp(-(v + 47.0) / 20.0)
         beta = 2.8 / (1.0 + save_exp(-0.1 * (v + 20.0)))
         return alpha, beta
@@ -124,9 +217,14 @@ class Na(Channel):
 class Kdr(Channel):
     """Delayed Rectifier Potassium channel"""
 
-    def __init__(self, name: Optional[str] = None):
+    def __init__(self, name: Optional[str] = None, gate_dtype=None, use_table=False):
         self.current_is_in_mA_per_cm2 = True
         super().__init__(name)
+        self._gate_dtype = gate_dtype
+        self._use_table = use_table
+        if use_table:
+            self._v_grid = jnp.linspace(*_TABLE_V_RANGE, _TABLE_SIZE)
+            self._m_table = _tabulate_rates(Kdr.m_gate, self._v_grid)
         prefix = self._name
         self.channel_params = {
             f"{prefix}_gKdr": 75e-3,  # S/cm^2
@@ -136,34 +234,50 @@ class Kdr(Channel):
         self.current_name = f"iK"
         self.META = META
         self.META.update({"ion": "K"})
+        self._cache_keys()
+
+    def _cache_keys(self):
+        """Cache the prefixed param/state keys so the hot methods skip f-strings."""
+        prefix = self._name
+        self._k_m = f"{prefix}_m"
+        self._k_gKdr = f"{prefix}_gKdr"
+
+    def change_name(self, new_name: str):
+        super().change_name(new_name)
+        self._cache_keys()
+        return self
 
     def update_states(
         self, states: Dict[str, jnp.ndarray], dt, v, params: Dict[str, jnp.ndarray]
     ):
         """""Return the updated states.""" ""
-        prefix = self._name
-        m = states[f"{prefix}_m"]
-        new_m = solve_gate_exponential(m, dt, *Kdr.m_gate(v))
-        return {f"{prefix}_m": new_m}
+        m = _promote_gate(states[self._k_m], self._gate_dtype)
+        new_m = solve_gate_exponential(m, dt, *self._m_rates(v))
+        return {self._k_m: _demote_gate(new_m, self._gate_dtype)}
 
     def compute_current(
         self, states: Dict[str, jnp.ndarray], v, params: Dict[str, jnp.ndarray]
     ):
         """""Return the updated states.""" ""
-        prefix = self._name
-        m = states[f"{prefix}_m"]
-        gKdr = params[f"{prefix}_gKdr"] * m**4  # S/cm^2
+        m = _promote_gate(states[self._k_m], self._gate_dtype)
+        m2 = m * m
+        gKdr = params[self._k_gKdr] * m2 * m2  # S/cm^2
 
         return gKdr * (v - params[f"eK"])  # S/cm^2 * mV = mA/cm^2
 
     def init_state(self, states, v, params, delta_t):
         """Initialize the state such at fixed point of gate dynamics."""
-        prefix = self._name
-        alpha_m, beta_m = Kdr.m_gate(v)
+        alpha_m, beta_m = self._m_rates(v)
         return {
-            f"{prefix}_m": alpha_m / (alpha_m + beta_m),
+            self._k_m: _demote_gate(alpha_m / (alpha_m + beta_m), self._gate_dtype),
         }
 
+    def _m_rates(self, v):
+        """m-gate rates, interpolated from the table when enabled."""
+        if self._use_table:
+            return _interp_rates(v, self._v_grid, self._m_table)
+        return Kdr.m_gate(v)
+
     @staticmethod
     def m_gate(v):
         v += 1e-6
@@ -173,17 +287,23 @@ class Kdr(Channel):
         # beta = 0.083 * jnp.exp(-(v + 15.0) / 15.0)
 
         # modified rate constant
-        alpha = 0.0065 * (v + 30.0) / (1.0 - jnp.exp(-(v + 30.0) / 10.0))
-        beta = 0.083 * jnp.exp(-(v + 15.0) / 15.0)
+        alpha = 0.0065 * efun(-(v + 30.0), 10.0)
+        beta = 0.083 * save_exp(-(v + 15.0) / 15.0)
         return alpha, beta
 
 
 class KA(Channel):
     """A type Potassium channel"""
 
-    def __init__(self, name: Optional[str] = None):
+    def __init__(self, name: Optional[str] = None, gate_dtype=None, use_table=False):
         self.current_is_in_mA_per_cm2 = True
         super().__init__(name)
+        self._gate_dtype = gate_dtype
+        self._use_table = use_table
+        if use_table:
+            self._v_grid = jnp.linspace(*_TABLE_V_RANGE, _TABLE_SIZE)
+            self._m_table = _tabulate_rates(KA.m_gate, self._v_grid)
+            self._h_table = _tabulate_rates(KA.h_gate, self._v_grid)
         prefix = self._name
         self.channel_params = {
             f"{prefix}_gKA": 1.5e-3,  # S/cm^2
@@ -193,6 +313,19 @@ class KA(Channel):
         self.current_name = f"iK"
         self.META = META
         self.META.update({"ion": "K"})
+        self._cache_keys()
+
+    def _cache_keys(self):
+        """Cache the prefixed param/state keys so the hot methods skip f-strings."""
+        prefix = self._name
+        self._k_m = f"{prefix}_m"
+        self._k_h = f"{prefix}_h"
+        self._k_gKA = f"{prefix}_gKA"
+
+    def change_name(self, new_name: str):
+        super().change_name(new_name)
+        self._cache_keys()
+        return self
 
     def update_states(
         self,
@@ -202,41 +335,54 @@ class KA(Channel):
         params: Dict[str, jnp.ndarray],
     ):
         """Return the updated states."""
-        prefix = self._name
-        m, h = states[f"{prefix}_m"], states[f"{prefix}_h"]
-        new_m = solve_gate_exponential(m, dt, *KA.m_gate(v))
-        new_h = solve_inf_gate_exponential(h, dt, *KA.h_gate(v))
-        return {f"{prefix}_m": new_m, f"{prefix}_h": new_h}
+        m = _promote_gate(states[self._k_m], self._gate_dtype)
+        h = _promote_gate(states[self._k_h], self._gate_dtype)
+        new_m = solve_gate_exponential(m, dt, *self._m_rates(v))
+        new_h = solve_inf_gate_exponential(h, dt, *self._h_rates(v))
+        return {
+            self._k_m: _demote_gate(new_m, self._gate_dtype),
+            self._k_h: _demote_gate(new_h, self._gate_dtype),
+        }
 
     def compute_current(
         self, states: Dict[str, jnp.ndarray], v, params: Dict[str, jnp.ndarray]
     ):
         """Return the updated states."""
-        prefix = self._name
-        m, h = states[f"{prefix}_m"], states[f"{prefix}_h"]
-        gKA = params[f"{prefix}_gKA"] * (m**3) * h  # S/cm^2
+        m = _promote_gate(states[self._k_m], self._gate_dtype)
+        h = _promote_gate(states[self._k_h], self._gate_dtype)
+        gKA = params[self._k_gKA] * (m * m) * (m * h)  # S/cm^2
         return gKA * (v - params[f"eK"])  # S/cm^2 * mV = mA/cm^2
 
     def init_state(self, states, v, params, delta_t):
         """Initialize the state such at fixed point of gate dynamics."""
-        prefix = self._name
-        alpha_m, beta_m = KA.m_gate(v)
-        h_inf, _ = KA.h_gate(v)
+        alpha_m, beta_m = self._m_rates(v)
+        h_inf, _ = self._h_rates(v)
         return {
-            f"{prefix}_m": alpha_m / (alpha_m + beta_m),
-            f"{prefix}_h": h_inf,
+            self._k_m: _demote_gate(alpha_m / (alpha_m + beta_m), self._gate_dtype),
+            self._k_h: _demote_gate(h_inf, self._gate_dtype),
         }
 
+    def _m_rates(self, v):
+        """m-gate rates, interpolated from the table when enabled."""
+        if self._use_table:
+            return _interp_rates(v, self._v_grid, self._m_table)
+        return KA.m_gate(v)
+
+    def _h_rates(self, v):
+        """h-gate inf/tau, interpolated from the table when enabled."""
+        if self._use_table:
+            return _interp_rates(v, self._v_grid, self._h_table)
+        return KA.h_gate(v)
+
     @staticmethod
     def m_gate(v):
         v += 1e-6
-        alpha = 0.02 * (v + 15) / (1 - save_exp(-0.12 * (v + 15)) + 1e-6)
+        alpha = 0.02 * efun(-(v + 15.0), 1.0 / 0.12)
         beta = 0.05 * save_exp(-(v + 1.0) / 30.0)
         return alpha, beta
 
     @staticmethod
     def h_gate(v):
-        v += 1e-6
         h_inf = 1.0 / (1.0 + save_exp((v + 62.0) / 6.35))
         tau_h = jnp.array(25.0)  # ms, fixed time constant
         return h_inf, tau_h
@@ -245,9 +391,14 @@ class KA(Channel):
 class CaL(Channel):
     """L-type Calcium channel"""
 
-    def __init__(self, name: Optional[str] = None):
+    def __init__(self, name: Optional[str] = None, gate_dtype=None, use_table=False):
         self.current_is_in_mA_per_cm2 = True
         super().__init__(name)
+        self._gate_dtype = gate_dtype
+        self._use_table = use_table
+        if use_table:
+            self._v_grid = jnp.linspace(*_TABLE_V_RANGE, _TABLE_SIZE)
+            self._m_table = _tabulate_rates(CaL.m_gate, self._v_grid)
         prefix = self._name
         self.channel_params = {
             f"{prefix}_gCaL": 2e-3,  # S/cm^2
@@ -256,6 +407,18 @@ class CaL(Channel):
         self.current_name = f"iCa"
         self.META = META
         self.META.update({"ion": "Ca"})
+        self._cache_keys()
+
+    def _cache_keys(self):
+        """Cache the prefixed param/state keys so the hot methods skip f-strings."""
+        prefix = self._name
+        self._k_m = f"{prefix}_m"
+        self._k_gCaL = f"{prefix}_gCaL"
+
+    def change_name(self, new_name: str):
+        super().change_name(new_name)
+        self._cache_keys()
+        return self
 
     def update_states(
         self,
@@ -265,35 +428,38 @@ class CaL(Channel):
         params: Dict[str, jnp.ndarray],
     ):
         """Return the updated states."""
-        prefix = self._name
-        m = states[f"{prefix}_m"]
-        new_m = solve_gate_exponential(m, dt, *CaL.m_gate(v))
+        m = _promote_gate(states[self._k_m], self._gate_dtype)
+        new_m = solve_gate_exponential(m, dt, *self._m_rates(v))
         return {
-            f"{prefix}_m": new_m,
+            self._k_m: _demote_gate(new_m, self._gate_dtype),
         }
 
     def compute_current(
         self, states: Dict[str, jnp.ndarray], v, params: Dict[str, jnp.ndarray]
     ):
         """Return the updated states."""
-        prefix = self._name
-        m = states[f"{prefix}_m"]
-        gCaL = params[f"{prefix}_gCaL"] * (m**2)  # S/cm^2
+        m = _promote_gate(states[self._k_m], self._gate_dtype)
+        gCaL = params[self._k_gCaL] * m * m  # S/cm^2
         current = gCaL * (v - states["eCa"])  # S/cm^2 * mV = mA/cm^2
         return current
 
     def init_state(self, states, v, params, delta_t):
         """Initialize the state such at fixed point of gate dynamics."""
-        prefix = self._name
-        alpha_m, beta_m = CaL.m_gate(v)
+        alpha_m, beta_m = self._m_rates(v)
         return {
-            f"{prefix}_m": alpha_m / (alpha_m + beta_m),
+            self._k_m: _demote_gate(alpha_m / (alpha_m + beta_m), self._gate_dtype),
         }
 
+    def _m_rates(self, v):
+        """m-gate rates, interpolated from the table when enabled."""
+        if self._use_table:
+            return _interp_rates(v, self._v_grid, self._m_table)
+        return CaL.m_gate(v)
+
     @staticmethod
     def m_gate(v):
         v += 1e-6
-        alpha = 0.061 * (v - 3.0) / (1.0 - save_exp(-(v - 3.0) / 12.5))
+        alpha = 0.061 * efun(-(v - 3.0), 12.5)
         beta = 0.058 * save_exp(-(v - 10.0) / 15.0)
         return alpha, beta
 
@@ -301,9 +467,15 @@ class CaL(Channel):
 class CaN(Channel):
     """N-type Ca channel"""
 
-    def __init__(self, name: Optional[str] = None):
+    def __init__(self, name: Optional[str] = None, gate_dtype=None, use_table=False):
         self.current_is_in_mA_per_cm2 = True
         super().__init__(name)
+        self._gate_dtype = gate_dtype
+        self._use_table = use_table
+        if use_table:
+            self._v_grid = jnp.linspace(*_TABLE_V_RANGE, _TABLE_SIZE)
+            self._m_table = _tabulate_rates(CaN.m_gate, self._v_grid)
+            self._h_table = _tabulate_rates(CaN.h_gate, self._v_grid)
         prefix = self._name
         self.channel_params = {
             f"{prefix}_gCaN": 1.5e-3,  # S/cm^2
@@ -312,6 +484,19 @@ class CaN(Channel):
         self.current_name = f"iCa"
         self.META = META
         self.META.update({"ion": "Ca"})
+        self._cache_keys()
+
+    def _cache_keys(self):
+        """Cache the prefixed param/state keys so the hot methods skip f-strings."""
+        prefix = self._name
+        self._k_m = f"{prefix}_m"
+        self._k_h = f"{prefix}_h"
+        self._k_gCaN = f"{prefix}_gCaN"
+
+    def change_name(self, new_name: str):
+        super().change_name(new_name)
+        self._cache_keys()
+        return self
 
     def update_states(
         self,
@@ -321,41 +506,54 @@ class CaN(Channel):
         params: Dict[str, jnp.ndarray],
     ):
         """Return the updated states."""
-        prefix = self._name
-        m, h = states[f"{prefix}_m"], states[f"{prefix}_h"]
-        new_m = solve_gate_exponential(m, dt, *CaN.m_gate(v))
-        new_h = solve_gate_exponential(h, dt, *CaN.h_gate(v))
-        return {f"{prefix}_m": new_m, f"{prefix}_h": new_h}
+        m = _promote_gate(states[self._k_m], self._gate_dtype)
+        h = _promote_gate(states[self._k_h], self._gate_dtype)
+        new_m = solve_gate_exponential(m, dt, *self._m_rates(v))
+        new_h = solve_gate_exponential(h, dt, *self._h_rates(v))
+        return {
+            self._k_m: _demote_gate(new_m, self._gate_dtype),
+            self._k_h: _demote_gate(new_h, self._gate_dtype),
+        }
 
     def compute_current(
         self, states: Dict[str, jnp.ndarray], v, params: Dict[str, jnp.ndarray]
     ):
         """Return the updated states."""
-        prefix = self._name
-        m, h = states[f"{prefix}_m"], states[f"{prefix}_h"]
-        gCaN = params[f"{prefix}_gCaN"] * (m**2) * h  # S/cm^2
+        m = _promote_gate(states[self._k_m], self._gate_dtype)
+        h = _promote_gate(states[self._k_h], self._gate_dtype)
+        gCaN = params[self._k_gCaN] * m * m * h  # S/cm^2
         return gCaN * (v - states[f"eCa"])  # S/cm^2 * mV = mA/cm^2
 
     def init_state(self, states, v, params, delta_t):
         """Initialize the state such at fixed point of gate dynamics."""
-        prefix = self._name
-        alpha_m, beta_m = CaN.m_gate(v)
-        alpha_h, beta_h = CaN.h_gate(v)
+        alpha_m, beta_m = self._m_rates(v)
+        alpha_h, beta_h = self._h_rates(v)
         return {
-            f"{prefix}_m": alpha_m / (alpha_m + beta_m),
-            f"{prefix}_h": alpha_h / (alpha_h + beta_h),
+            self._k_m: _demote_gate(alpha_m / (alpha_m + beta_m), self._gate_dtype),
+            self._k_h: _demote_gate(alpha_h / (alpha_h + beta_h), self._gate_dtype),
         }
 
+    def _m_rates(self, v):
+        """m-gate rates, interpolated from the table when enabled."""
+        if self._use_table:
+            return _interp_rates(v, self._v_grid, self._m_table)
+        return CaN.m_gate(v)
+
+    def _h_rates(self, v):
+        """h-gate rates, interpolated from the table when enabled."""
+        if self._use_table:
+            return _interp_rates(v, self._v_grid, self._h_table)
+        return CaN.h_gate(v)
+
     @staticmethod
     def m_gate(v):
         v += 1e-6
-        alpha = 0.1 * (v - 20.0) / (1.0 - save_exp(-0.1 * (v - 20.0)))
+        alpha = 0.1 * efun(-(v - 20.0), 10.0)
         beta = 0.4 * save_exp(-(v + 25.0) / 18.0)
         return alpha, beta
 
     @staticmethod
     def h_gate(v):
-        v += 1e-6
         alpha = 0.01 * save_exp(-(v + 50.0) / 10.0)
         beta = 0.1 / (1.0 + save_exp(-(v + 17.0) / 17.0))
         return alpha, beta
@@ -402,7 +600,9 @@ class CaPumpNS(Channel):
 
         v_pump = params["v_pump"]
         K_pump = params["K_pump"]
-        j_pump = v_pump * (Cai**4 / (Cai**4 + K_pump**4))
+        Cai2, K_pump2 = Cai * Cai, K_pump * K_pump
+        Cai4, K_pump4 = Cai2 * Cai2, K_pump2 * K_pump2
+        j_pump = v_pump * (Cai4 / (Cai4 + K_pump4))
 
         iCa = states["iCa"]
 
@@ -441,6 +641,16 @@ class KCa(Channel):
         self.current_name = f"iK"
         self.META = META
         self.META.update({"ion": "K"})
+        self._cache_keys()
+
+    def _cache_keys(self):
+        """Cache the prefixed param keys so the hot methods skip f-strings."""
+        self._k_gKCa = f"{self._name}_gKCa"
+
+    def change_name(self, new_name: str):
+        super().change_name(new_name)
+        self._cache_keys()
+        return self
 
     def update_states(
         self, states: Dict[str, jnp.ndarray], dt, v, params: Dict[str, jnp.ndarray]
@@ -452,25 +662,19 @@ class KCa(Channel):
         self, states: Dict[str, jnp.ndarray], v, params: Dict[str, jnp.ndarray]
     ):
         """""Return the updated states.""" ""
-        prefix = self._name
         Cai = states["Cai"]
         K_KCa = params["K_KCa"]  # mM
 
-        # current resulted from the fourth-power will be too small
-        # given the values of Cai and K_KCa provided in the paper
-        # gKCa = (
-        #     params[f"{prefix}_gKCa"] * (Cai**4 / (Cai**4 + K_KCa**4)) * 1000
-        # )  # mS/cm^2, multiply with 1000 to convert Siemens to milli Siemens.
-
-        # changed to the second-power from fm97
-        x = (Cai / K_KCa) ** 2
-        gKCa = params[f"{prefix}_gKCa"] * (x / (1 + x))  # S/cm^2
+        # Second-power dependence as in fm97; the paper's fourth power gives a
+        # negligible current for the Cai and K_KCa values it provides.
+        x = Cai / K_KCa
+        x2 = x * x
+        gKCa = params[self._k_gKCa] * (x2 / (1 + x2))  # S/cm^2
 
         return gKCa * (v - params[f"eK"])  # S/cm^2 * mV = mA/cm^2
 
     def init_state(self, states, v, params, delta_t):
         """Initialize the state such at fixed point of gate dynamics."""
-        prefix = self._name
         return {}
 
 
@@ -514,3 +718,143 @@ class CaNernstReversal(Channel):
     def init_state(self, states, v, params, delta_t):
         """Initialize the state at fixed point of gate dynamics."""
         return {}
+
+
+class GateRates(NamedTuple):
+    """Rates of all voltage-gated channels of this module at one voltage."""
+
+    alpha_m_na: jnp.ndarray
+    beta_m_na: jnp.ndarray
+    alpha_h_na: jnp.ndarray
+    beta_h_na: jnp.ndarray
+    alpha_m_kdr: jnp.ndarray
+    beta_m_kdr: jnp.ndarray
+    alpha_m_ka: jnp.ndarray
+    beta_m_ka: jnp.ndarray
+    inf_h_ka: jnp.ndarray
+    tau_h_ka: jnp.ndarray
+    alpha_m_cal: jnp.ndarray
+    beta_m_cal: jnp.ndarray
+    alpha_m_can: jnp.ndarray
+    beta_m_can: jnp.ndarray
+    alpha_h_can: jnp.ndarray
+    beta_h_can: jnp.ndarray
+
+
+@jax.jit
+def fused_rates(v):
+    """Compute the rates of all voltage-gated channels in one traced function.
+
+    Evaluating the rates together lets XLA eliminate the subexpressions that
+    the gates share (e.g. repeated voltage offsets) and fuse the elementwise
+    ops into fewer kernels than tracing each channel's gates separately.
+    """
+    return GateRates(
+        *Na.m_gate(v),
+        *Na.h_gate(v),
+        *Kdr.m_gate(v),
+        *KA.m_gate(v),
+        *KA.h_gate(v),
+        *CaL.m_gate(v),
+        *CaN.m_gate(v),
+        *CaN.h_gate(v),
+    )
+
+
+@jax.jit
+def update_all_gates(
+    states: Dict[str, jnp.ndarray], dt, v, rates: Optional[GateRates] = None
+):
+    """Advance the gates of Na, Kdr, KA, CaL and CaN in one traced function.
+
+    Convenience for custom steppers that drive the channels directly; inside
+    Jaxley's integrator each channel's `update_states` is traced on its own.
+    Assumes the channels are inserted under their default names. Jitted at
+    module level so repeated direct calls share one compile cache across all
+    channel instances, keyed on the state shapes and dtypes.
+    """
+    rates = fused_rates(v) if rates is None else rates
+    return {
+        "Na_m": solve_gate_exponential(
+            states["Na_m"], dt, rates.alpha_m_na, rates.beta_m_na
+        ),
+        "Na_h": solve_gate_exponential(
+            states["Na_h"], dt, rates.alpha_h_na, rates.beta_h_na
+        ),
+        "Kdr_m": solve_gate_exponential(
+            states["Kdr_m"], dt, rates.alpha_m_kdr, rates.beta_m_kdr
+        ),
+        "KA_m": solve_gate_exponential(
+            states["KA_m"], dt, rates.alpha_m_ka, rates.beta_m_ka
+        ),
+        "KA_h": solve_inf_gate_exponential(
+            states["KA_h"], dt, rates.inf_h_ka, rates.tau_h_ka
+        ),
+        "CaL_m": solve_gate_exponential(
+            states["CaL_m"], dt, rates.alpha_m_cal, rates.beta_m_cal
+        ),
+        "CaN_m": solve_gate_exponential(
+            states["CaN_m"], dt, rates.alpha_m_can, rates.beta_m_can
+        ),
+        "CaN_h": solve_gate_exponential(
+            states["CaN_h"], dt, rates.alpha_h_can, rates.beta_h_can
+        ),
+    }
+
+
+# Struct-of-arrays layout of all gates of this module: one contiguous buffer
+# of shape `(..., len(GATE_NAMES))`, with `GATE_INDEX` mapping gate -> column.
+GATE_NAMES = ("Na_m", "Na_h", "Kdr_m", "KA_m", "KA_h", "CaL_m", "CaN_m", "CaN_h")
+GATE_INDEX = {name: index for index, name in enumerate(GATE_NAMES)}
+
+
+def gates_to_array(states: Dict[str, jnp.ndarray]):
+    """Pack the gate states of all channels into one contiguous buffer.
+
+    Returns an array of shape `(n_compartments, len(GATE_NAMES))`, so custom
+    steppers touch a single coalesced buffer instead of one array per key.
+    """
+    return jnp.stack([jnp.asarray(states[name]) for name in GATE_NAMES], axis=-1)
+
+
+def gates_from_array(gates: jnp.ndarray):
+    """Unpack a gate buffer produced by `gates_to_array` into a state dict."""
+    return {name: gates[..., index] for name, index in GATE_INDEX.items()}
+
+
+def _update_gates_single(gates: jnp.ndarray, dt, v):
+    """Advance the gates of a single compartment, `gates` of shape `(n_gates,)`."""
+    new_states = update_all_gates(gates_from_array(gates), dt, v)
+    return jnp.stack([new_states[name] for name in GATE_NAMES], axis=-1)
+
+
+@jax.jit
+def update_gates_soa(gates: jnp.ndarray, dt, v):
+    """Advance all gates on the struct-of-arrays buffer in one traced function.
+
+    Struct-of-arrays counterpart of `update_all_gates` for steppers that keep
+    the gates packed via `gates_to_array`. The single-compartment step is
+    `vmap`-ed over the leading axis, so `gates` must have shape
+    `(n_compartments, n_gates)` and `v` shape `(n_compartments,)`; XLA lowers
+    the batch to one vectorized elementwise kernel.
+    """
+    return jax.vmap(_update_gates_single, in_axes=(0, None, 0))(gates, dt, v)
+
+
+@jax.jit
+def fused_calcium_currents(states: Dict[str, jnp.ndarray], v, params: Dict[str, jnp.ndarray]):
+    """Compute the CaL and CaN currents with one shared `v - eCa` driving force.
+
+    Both calcium channels subtract the same `eCa` state from the voltage;
+    computing the driving force once reuses it for both conductances. Inside
+    Jaxley's integrator XLA's common-subexpression elimination already merges
+    the two subtractions when the channels are traced together, so this helper
+    is for custom steppers that evaluate the currents directly. Assumes the
+    channels are inserted under their default names.
+    """
+    driving_force = v - states["eCa"]  # mV
+    m_cal = states["CaL_m"]
+    m_can, h_can = states["CaN_m"], states["CaN_h"]
+    i_cal = params["CaL_gCaL"] * (m_cal * m_cal) * driving_force  # mA/cm^2
+    i_can = params["CaN_gCaN"] * (m_can * m_can) * h_can * driving_force  # mA/cm^2
+    return i_cal, i_can
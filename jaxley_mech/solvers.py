@@ -2,7 +2,6 @@ from typing import Any, Callable, Optional, Tuple
 
 import equinox as eqx
 import jax
-import jax.debug
 import jax.numpy as jnp
 import optimistix as optx
 from diffrax import ImplicitEuler, ODETerm, diffeqsolve
@@ -154,9 +153,6 @@ def newton(
         # Increment iteration count
         i += 1
 
-        # Debugging
-        # jax.debug.print("Iteration {}: Converged = {}", i, converged)
-
         return y, y_prev, i, converged
 
     def cond_fun(carry: Tuple[jnp.ndarray, jnp.ndarray, int, bool]) -> bool: